@@ -1,8 +1,13 @@
+import struct
+
+
 # Command line arguments.
 DRY_RUN_ARG = "--dry-run"
 DRY_RUN_SHORT_ARG = "-d"
 INCLUDE_GIT_ARG = "--include-git"
 INCLUDE_GIT_SHORT_ARG = "-g"
+JOBS_ARG = "--jobs"
+JOBS_SHORT_ARG = "-j"
 LIST_IMMUTABLE_ARG = "--list-immutable"
 LIST_MUTABLE_ARG = "--list-mutable"
 REPORT_ARG = "--report"
@@ -13,11 +18,36 @@ VERSION_ARG = "--version"
 VERSION_SHORT_ARG = "-v"
 
 
+# Command line argument defaults.
+DEFAULT_JOBS = 8
+
+
 # Formatting
 TABLE_WIDTH = 40
+TABLE_SEPARATOR = "-" * TABLE_WIDTH
+
+
+# The number of files whose attributes are changed together by one command.
+CHANGE_BATCH_SIZE = 1000
+
+
+# The number of paths walked before examining begins. If the walk finishes
+# first its total file path count is known, otherwise only the count of
+# examined file paths is shown.
+READ_AHEAD_LIMIT = 10000
+
+
+# Inode flags, as used by lsattr and chattr. The kernel defines the ioctl
+# numbers as _IOR("f", 1, long) and _IOW("f", 2, long), so their values depend
+# on the size of a long.
+FS_IMMUTABLE_FL = 0x00000010
+FS_IOC_GETFLAGS = 0x80006601 | (struct.calcsize("l") << 16)
+FS_IOC_SETFLAGS = 0x40006602 | (struct.calcsize("l") << 16)
 
 
-# Path types.
+# Path types. A special file is a device node, named pipe or socket, which is
+# never opened, as opening one can have side effects.
 DIRECTORY = "directory"
 FILE = "file"
 LINK = "link"
+SPECIAL_FILE = "special file"
@@ -94,7 +94,11 @@ def main(argv):
 
     # If a report is requested, print it then return a zero exit status.
     if args.report:
-        reporting.produce_report(absolute_path, include_git=args.include_git)
+        reporting.produce_report(
+            absolute_path,
+            include_git=args.include_git,
+            jobs=args.jobs,
+        )
         return 0
 
     # If a list of immutable objects is requested, print it then return a zero
@@ -104,6 +108,7 @@ def main(argv):
             absolute_path,
             immutable=True,
             include_git=args.include_git,
+            jobs=args.jobs,
         )
         return 0
 
@@ -114,6 +119,7 @@ def main(argv):
             absolute_path,
             immutable=False,
             include_git=args.include_git,
+            jobs=args.jobs,
         )
         return 0
 
@@ -124,6 +130,7 @@ def main(argv):
         immutable=not args.unset,
         include_git=args.include_git,
         dry_run=args.dry_run,
+        jobs=args.jobs,
     )
     return 0
 
@@ -310,6 +317,16 @@ def _parse_args(argv):
         action="store_true",
         help="include .git directories (excluded by default)",
     )
+    parser.add_argument(
+        constants.JOBS_SHORT_ARG,
+        constants.JOBS_ARG,
+        default=constants.DEFAULT_JOBS,
+        help="examine N files at once (default {})".format(
+            constants.DEFAULT_JOBS,
+        ),
+        metavar="N",
+        type=_positive_integer,
+    )
     parser.add_argument(
         constants.LIST_IMMUTABLE_ARG,
         action="store_true",
@@ -342,6 +359,37 @@ def _parse_args(argv):
     return parser.parse_args(argv[1:])
 
 
+def _positive_integer(string):
+    """Convert a command line argument to a positive integer.
+
+    Parameters
+    ----------
+    string : str
+        The argument as given at the command line.
+
+    Returns
+    -------
+    int
+        The positive integer.
+
+    Raises
+    ------
+    ArgumentTypeError
+        If the argument is not a positive integer.
+
+    """
+    try:
+        integer = int(string)
+    except ValueError:
+        integer = 0
+
+    if integer < 1:
+        msg = "{} is not a positive integer".format(string)
+        raise argparse.ArgumentTypeError(msg)
+
+    return integer
+
+
 def _print_argument_conflict_errors(conflicts):
     """Print the list of command line argument conflicts.
 
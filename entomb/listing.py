@@ -1,14 +1,15 @@
-import datetime
+import functools
 import os
 
 from entomb import (
+    constants,
     exceptions,
     utilities,
 )
 
 
 @utilities.hide_cursor()
-def list_files(path, immutable, include_git):
+def list_files(path, immutable, include_git, jobs=constants.DEFAULT_JOBS):
     """Print a list of the immutable or mutable files on the path.
 
     Parameters
@@ -19,6 +20,8 @@ def list_files(path, immutable, include_git):
         List immutable files if True, mutable files if False.
     include_git: bool
         Whether to include git files and directories.
+    jobs: int, optional
+        The number of files to examine at once. The default is 8.
 
     Returns
     -------
@@ -47,35 +50,31 @@ def list_files(path, immutable, include_git):
     list_header = "{} files".format(state.title())
     utilities.print_header(list_header)
 
-    # Set up the progress bar.
-    total_file_paths = utilities.count_file_paths(path, include_git)
-    start_time = datetime.datetime.now()
-    utilities.print_progress_bar(start_time, 0, total_file_paths)
-
-    # Walk the tree.
-    for file_path in utilities.file_paths(path, include_git):
+    # Examine each path, deciding whether to print each file's path. The
+    # progress bar is redrawn straight after a path is printed over it.
+    examined_paths = utilities.examine_paths(
+        path,
+        include_git,
+        functools.partial(_print_the_path, immutable=immutable),
+        jobs,
+        redraw_after=bool,
+    )
+    for file_path, path_type, print_the_path in examined_paths:
 
         # Count the link.
-        if os.path.islink(file_path):
+        if path_type == constants.LINK:
             link_count += 1
 
-        # Count the file and print its path if appropriate.
-        else:
-            if _print_the_path(file_path, immutable):
+        # Count the file and print its path if appropriate. A special file
+        # isn't examined, so its path is never printed.
+        elif path_type in (constants.FILE, constants.SPECIAL_FILE):
+            if print_the_path:
                 printed_file_count += 1
                 utilities.clear_line()
                 print(file_path)
 
             file_count += 1
 
-        # Update the progress bar.
-        utilities.print_progress_bar(
-            start_time,
-            (file_count + link_count),
-            total_file_paths,
-            1,
-        )
-
     # Clear the final progress message.
     utilities.clear_line()
 
@@ -99,7 +98,7 @@ def _print_the_path(path, immutable):
     mutable.
 
     The path should not be printed if the immutability attribute can't be
-    accessed.
+    accessed, for instance because the path is a link or no longer exists.
 
     Parameters
     ----------
@@ -113,22 +112,10 @@ def _print_the_path(path, immutable):
     bool
         Whether to print the file path.
 
-    Raises
-    ------
-    AssertionError
-        If the path is a directory, is a link or does not exist.
-
     """
-    # Parameter check.
-    assert not os.path.isdir(path)
-    assert not os.path.islink(path)
-    assert os.path.exists(path)
     try:
         is_immutable = utilities.file_is_immutable(path)
     except exceptions.GetAttributeError:
         return False
 
-    print_immutable_file_path = is_immutable and immutable
-    print_mutable_file_path = not is_immutable and not immutable
-
-    return print_immutable_file_path or print_mutable_file_path
+    return is_immutable == immutable
@@ -1,15 +1,21 @@
-import datetime
+import collections
+import fcntl
+import functools
+import itertools
 import os
+import struct
 import subprocess
 
 from entomb import (
+    constants,
     exceptions,
     utilities,
 )
 
 
 @utilities.hide_cursor()
-def process_objects(path, immutable, include_git, dry_run):
+def process_objects(path, immutable, include_git, dry_run,
+                    jobs=constants.DEFAULT_JOBS):
     """Set or unset the immutable attribute for all files on a path.
 
     Parameters
@@ -22,6 +28,8 @@ def process_objects(path, immutable, include_git, dry_run):
         Whether to include git files and directories.
     dry_run: bool
         Whether to do a dry run which makes no changes.
+    jobs: int, optional
+        The number of files to examine at once. The default is 8.
 
     Returns
     -------
@@ -37,11 +45,8 @@ def process_objects(path, immutable, include_git, dry_run):
     assert os.path.exists(path)
 
     # Set up.
-    attribute_changed_count = 0
-    attribute_settable_count = 0
+    counts = collections.Counter()
     errors = []
-    file_count = 0
-    link_count = 0
     operation = "entombed" if immutable else "unset"
 
     # Print the operation.
@@ -51,61 +56,36 @@ def process_objects(path, immutable, include_git, dry_run):
         print("Unset objects")
     print()
 
-    # Print the progress header and set up the progress bar.
-    utilities.print_header("Progress")
-    total_file_paths = utilities.count_file_paths(path, include_git)
-    start_time = datetime.datetime.now()
-    utilities.print_progress_bar(start_time, 0, total_file_paths)
-
-    # Walk the tree.
-    for file_path in utilities.file_paths(path, include_git):
-
-        # Count links, but don't try to operate on them as they don't have
-        # an immutable attribute.
-        if os.path.islink(file_path):
-            link_count += 1
-
-        else:
-            # Change the file's attribute if necessary.
-            try:
-                attribute_was_changed = _process_object(
-                    file_path,
-                    immutable,
-                    dry_run,
-                )
-                attribute_settable_count += 1
-                if attribute_was_changed:
-                    attribute_changed_count += 1
-            except exceptions.SetAttributeError as error:
-                errors.append(error)
-
-            # Count the file.
-            file_count += 1
-
-        # Update the progress bar.
-        utilities.print_progress_bar(
-            start_time,
-            (file_count + link_count),
-            total_file_paths,
+    # Examine each path, changing the attributes of the files which need it
+    # as they are found, under a progress header.
+    with utilities.progress_section():
+        examined_paths = utilities.examine_paths(
+            path,
+            include_git,
+            functools.partial(_examine_file, immutable=immutable),
+            jobs,
         )
-
-    print()
-    print()
+        files_to_change = _files_to_change(examined_paths, counts, errors)
+        attribute_changed_count, change_errors = (
+            _change_attributes_in_batches(files_to_change, immutable, dry_run)
+        )
+    attribute_settable_count = counts["unchanged"] + attribute_changed_count
+    errors.extend(change_errors)
 
     # Print the changes.
-    if file_count > 0:
+    if counts[constants.FILE] > 0:
         utilities.print_header("Changes")
         print("{} {} files".format(operation.title(), attribute_changed_count))
         print()
 
     # Print a summary.
     utilities.print_header("Summary")
-    if file_count > 0:
+    if counts[constants.FILE] > 0:
         print(
             "All {} files for which immutability can be set are now {}"
             .format(attribute_settable_count, operation),
         )
-        print("All {} links were ignored".format(link_count))
+        print("All {} links were ignored".format(counts[constants.LINK]))
     else:
         print("No files were found")
     print()
@@ -114,6 +94,245 @@ def process_objects(path, immutable, include_git, dry_run):
     _print_errors(errors)
 
 
+def _attribute_needs_changing(path, immutable):
+    """Determine whether a file's immutable attribute needs to be changed.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of a file.
+    immutable: bool
+        Whether the file should be immutable.
+
+    Returns
+    -------
+    bool
+        Whether the immutable attribute needs to be changed.
+
+    Raises
+    ------
+    SetAttributeError
+        If the path's immutable attribute cannot be accessed, and so cannot be
+        set.
+
+    """
+    try:
+        is_immutable = utilities.file_is_immutable(path)
+    except exceptions.GetAttributeError:
+        msg = "Immutable attribute not settable for {}".format(path)
+        raise exceptions.SetAttributeError(msg)
+
+    return immutable != is_immutable
+
+
+def _change_attributes(paths, immutable, dry_run):
+    """Set or unset the immutable attribute for several files.
+
+    Parameters
+    ----------
+    paths : list of str
+        The absolute paths of files whose immutable attribute needs changing.
+    immutable: bool
+        Set immutable attributes if True, unset immutable attributes if False.
+    dry_run : bool
+        Whether to do a dry run which makes no changes.
+
+    Returns
+    -------
+    tuple of (int, list of SetAttributeError)
+        The number of files whose immutable attribute was changed, or if this
+        was a dry run, should have been changed, and an error for each file
+        whose immutable attribute could not be changed.
+
+    """
+    if dry_run:
+        return len(paths), []
+
+    errors = []
+
+    # With root privileges, the flag can be changed directly with ioctl calls
+    # rather than by running chattr through sudo.
+    if os.geteuid() == 0:
+        for path in paths:
+            try:
+                _set_immutable_flag(path, immutable)
+            except exceptions.SetAttributeError as error:
+                errors.append(error)
+        return len(paths) - len(errors), errors
+
+    attribute = "+i" if immutable else "-i"
+
+    for path_group in _group_paths(paths):
+        try:
+            _set_attribute(attribute, *path_group)
+        except exceptions.SetAttributeError:
+            # chattr doesn't say which of the files it failed on, so retry the
+            # files one at a time to find them.
+            for path in path_group:
+                try:
+                    _set_attribute(attribute, path)
+                except exceptions.SetAttributeError as error:
+                    errors.append(error)
+
+    return len(paths) - len(errors), errors
+
+
+def _change_attributes_in_batches(paths, immutable, dry_run):
+    """Set or unset the immutable attribute for files, a batch at a time.
+
+    The files' attributes are changed as their paths are generated, once
+    there are enough of them, as one chattr command can change many files'
+    attributes.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        The absolute paths of files whose immutable attribute needs changing.
+    immutable: bool
+        Set immutable attributes if True, unset immutable attributes if False.
+    dry_run : bool
+        Whether to do a dry run which makes no changes.
+
+    Returns
+    -------
+    tuple of (int, list of SetAttributeError)
+        The number of files whose immutable attribute was changed, or if this
+        was a dry run, should have been changed, and an error for each file
+        whose immutable attribute could not be changed.
+
+    """
+    changed_count = 0
+    errors = []
+
+    paths = iter(paths)
+    batch = list(itertools.islice(paths, constants.CHANGE_BATCH_SIZE))
+    while batch:
+        batch_changed_count, batch_errors = _change_attributes(
+            batch,
+            immutable,
+            dry_run,
+        )
+        changed_count += batch_changed_count
+        errors.extend(batch_errors)
+        batch = list(itertools.islice(paths, constants.CHANGE_BATCH_SIZE))
+
+    return changed_count, errors
+
+
+def _examine_file(path, immutable):
+    """Determine whether a file's immutable attribute needs to be changed.
+
+    Unlike _attribute_needs_changing(), an error is returned rather than
+    raised, so that examining files in a pool of threads is not stopped by a
+    file whose attribute can't be accessed.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of a file.
+    immutable: bool
+        Whether the file should be immutable.
+
+    Returns
+    -------
+    tuple of (bool, SetAttributeError or None)
+        Whether the immutable attribute needs to be changed, and the error if
+        it cannot be accessed.
+
+    """
+    try:
+        return _attribute_needs_changing(path, immutable), None
+    except exceptions.SetAttributeError as error:
+        return False, error
+
+
+def _files_to_change(examined_paths, counts, errors):
+    """Generate the paths of files whose immutable attribute needs changing.
+
+    Parameters
+    ----------
+    examined_paths : iterable of tuple of (str, str, tuple or None)
+        Paths, their path types and the examinations of files, as generated by
+        utilities.examine_paths() with _examine_file().
+    counts : collections.Counter
+        Counted as the paths are generated, by path type, with files whose
+        immutable attribute is already as required counted as "unchanged".
+    errors : list of SetAttributeError
+        Extended as the paths are generated, with an error for each file whose
+        immutable attribute can't be accessed.
+
+    Yields
+    ------
+    str
+        The absolute path of a file whose immutable attribute needs changing.
+
+    """
+    for file_path, path_type, examination in examined_paths:
+
+        # A special file is counted as a file, but its attribute can't be set
+        # as it isn't opened.
+        if path_type == constants.SPECIAL_FILE:
+            path_type = constants.FILE
+            msg = "Immutable attribute not settable for {}".format(file_path)
+            examination = False, exceptions.SetAttributeError(msg)
+
+        counts[path_type] += 1
+
+        # Links don't have an immutable attribute, so aren't operated on.
+        if path_type != constants.FILE:
+            continue
+
+        needs_changing, error = examination
+        if error:
+            errors.append(error)
+        elif needs_changing:
+            yield file_path
+        else:
+            counts["unchanged"] += 1
+
+
+def _group_paths(paths):
+    """Split paths into groups which can each be passed to one command.
+
+    The groups are kept well within the system's limit on the total size of a
+    command's arguments, which also has to hold the environment.
+
+    Parameters
+    ----------
+    paths : list of str
+        Absolute paths.
+
+    Yields
+    ------
+    list of str
+        A group of the paths, in their original order.
+
+    """
+    try:
+        size_limit = os.sysconf("SC_ARG_MAX") // 2
+    except (OSError, ValueError):
+        size_limit = 0
+    if size_limit <= 0:
+        size_limit = 128 * 1024
+
+    # Each argument takes its encoded length, a null terminator and a pointer.
+    pointer_size = struct.calcsize("P")
+
+    group = []
+    group_size = 0
+    for path in paths:
+        path_size = len(os.fsencode(path)) + 1 + pointer_size
+        if group and group_size + path_size > size_limit:
+            yield group
+            group = []
+            group_size = 0
+        group.append(path)
+        group_size += path_size
+
+    if group:
+        yield group
+
+
 def _print_errors(errors):
     """Print the list of errors resulting from file processing.
 
@@ -134,8 +353,10 @@ def _print_errors(errors):
     # Print the header.
     utilities.print_header("Errors")
 
-    # Print up to 10 errors.
-    for error in errors[:10]:
+    # Print up to 10 errors, sorted by their messages, which name their paths.
+    # The order the files were examined in depends on their inode numbers, so
+    # isn't meaningful.
+    for error in sorted(errors, key=str)[:10]:
         print(">> {}".format(error))
 
     # If there are more than 10 errors, print a message about how many more
@@ -148,64 +369,51 @@ def _print_errors(errors):
     print()
 
 
-def _process_object(path, immutable, dry_run):
-    """Set or unset the immutable attribute for a file.
+def _set_attribute(attribute, *paths):
+    """Set or unset an attribute for one or more files.
 
     Parameters
     ----------
-    path : str
-        The absolute path of a file.
-    immutable: bool
-        Set immutable attribute if True, unset immutable attribute if False.
-    dry_run : bool
-        Whether to do a dry run which makes no changes.
+    attribute: str
+        The attribute to be set. In the form of "+i" or "-i".
+    *paths : str
+        The absolute paths of one or more files.
 
     Returns
     -------
-    bool
-        Whether the immutable attribute was changed, or if this was a dry run,
-        should have been changed.
+    None
 
     Raises
     ------
-    AssertionError
-        If the path is a directory, is a link or does not exist.
     SetAttributeError
-        If the path's immutable attribute cannot be set.
+        If the exit status of the chattr command is non-zero.
 
     """
-    # Parameter check.
-    assert not os.path.isdir(path)
-    assert not os.path.islink(path)
-    assert os.path.exists(path)
-
     try:
-        is_immutable = utilities.file_is_immutable(path)
-    except exceptions.GetAttributeError:
-        msg = "Immutable attribute not settable for {}".format(path)
+        subprocess.run(
+            ["sudo", "chattr", attribute] + list(paths),
+            check=True,
+            stderr=subprocess.STDOUT,
+            stdout=subprocess.DEVNULL,
+        )
+    except subprocess.CalledProcessError:
+        msg = "Immutable attribute not settable for {}".format(
+            ", ".join(paths),
+        )
         raise exceptions.SetAttributeError(msg)
 
-    change_attribute = immutable != is_immutable
-
-    if change_attribute and not dry_run:
-        attribute = "+i" if immutable else "-i"
-        _set_attribute(attribute, path)
 
-    # The value of change_attribute is a proxy for whether the immutable
-    # attribute was changed, or if this was a dry run, should have been
-    # changed.
-    return change_attribute
+def _set_immutable_flag(path, immutable):
+    """Set or unset the immutable flag of a file with ioctl calls.
 
-
-def _set_attribute(attribute, path):
-    """Set or unset an attribute for a file.
+    These are the calls which chattr makes, and they need root privileges.
 
     Parameters
     ----------
-    attribute: str
-        The attribute to be set. In the form of "+i" or "-i".
     path : str
         The absolute path of a file.
+    immutable: bool
+        Set the immutable flag if True, unset it if False.
 
     Returns
     -------
@@ -214,16 +422,20 @@ def _set_attribute(attribute, path):
     Raises
     ------
     SetAttributeError
-        If the exit status of the chattr command is non-zero.
+        If the file's flags cannot be read or changed.
 
     """
     try:
-        subprocess.run(
-            ["sudo", "chattr", attribute, path],
-            check=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.DEVNULL,
-        )
-    except subprocess.CalledProcessError:
+        with utilities.inode_flags(path) as (file_descriptor, flags):
+            if immutable:
+                flags |= constants.FS_IMMUTABLE_FL
+            else:
+                flags &= ~constants.FS_IMMUTABLE_FL
+            fcntl.ioctl(
+                file_descriptor,
+                constants.FS_IOC_SETFLAGS,
+                struct.pack("i", flags),
+            )
+    except OSError:
         msg = "Immutable attribute not settable for {}".format(path)
         raise exceptions.SetAttributeError(msg)
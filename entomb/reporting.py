@@ -1,4 +1,3 @@
-import datetime
 import math
 import os
 
@@ -10,7 +9,7 @@ from entomb import (
 
 
 @utilities.hide_cursor()
-def produce_report(path, include_git):
+def produce_report(path, include_git, jobs=constants.DEFAULT_JOBS):
     """Print a report.
 
     Parameters
@@ -19,6 +18,8 @@ def produce_report(path, include_git):
         An absolute path.
     include_git: bool
         Whether to include git files and directories.
+    jobs: int, optional
+        The number of files to examine at once. The default is 8.
 
     Returns
     -------
@@ -49,55 +50,33 @@ def produce_report(path, include_git):
         _print_abbreviated_report(path)
         return
 
-    # Print the progress header and set up the progress bar.
-    utilities.print_header("Progress")
-    total_file_paths = utilities.count_file_paths(path, include_git)
-    start_time = datetime.datetime.now()
-    utilities.print_progress_bar(start_time, 0, total_file_paths)
-
-    # Walk the tree.
-    for root_dir, dirnames, filenames in os.walk(path):
-
-        # Exclude git files and directories if directed.
-        if not include_git:
-            dirnames[:] = [d for d in dirnames if d != ".git"]
-
-        # Count the directory.
-        directory_count += 1
+    # Examine each path under a progress header.
+    with utilities.progress_section():
+        examined_paths = utilities.examine_paths(
+            path,
+            include_git,
+            _examine_file,
+            jobs,
+        )
+        for _, path_type, is_immutable in examined_paths:
 
-        # Examine each file path.
-        for filename in filenames:
-            file_path = os.path.join(root_dir, filename)
+            # Count the directory.
+            if path_type == constants.DIRECTORY:
+                directory_count += 1
 
-            # Count the link.
-            if os.path.islink(file_path):
+            # Count the link. Its type was read from its directory listing, so
+            # it isn't examined.
+            elif path_type == constants.LINK:
                 link_count += 1
 
-            # Count the file.
+            # Count the file. A special file isn't examined, so is counted as
+            # inaccessible.
+            elif is_immutable is None:
+                inaccessible_file_count += 1
+            elif is_immutable:
+                immutable_file_count += 1
             else:
-                try:
-                    if utilities.file_is_immutable(file_path):
-                        immutable_file_count += 1
-                    else:
-                        mutable_file_count += 1
-                except exceptions.GetAttributeError:
-                    inaccessible_file_count += 1
-
-            # Update the progress bar.
-            total_count = (
-                immutable_file_count
-                + inaccessible_file_count
-                + link_count
-                + mutable_file_count
-            )
-            utilities.print_progress_bar(
-                start_time,
-                total_count,
-                total_file_paths,
-            )
-
-    print()
-    print()
+                mutable_file_count += 1
 
     _print_full_report(
         directory_count,
@@ -108,6 +87,31 @@ def produce_report(path, include_git):
     )
 
 
+def _examine_file(path):
+    """Determine whether a file is immutable.
+
+    An inaccessible immutable attribute is returned as None rather than raised
+    as an error, so that examining files in a pool of threads is not stopped
+    by a file whose attribute can't be accessed.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of a file.
+
+    Returns
+    -------
+    bool or None
+        Whether the file is immutable, or None if its immutable attribute
+        cannot be accessed.
+
+    """
+    try:
+        return utilities.file_is_immutable(path)
+    except exceptions.GetAttributeError:
+        return None
+
+
 def _print_abbreviated_report(path):
     """Print a report for a path which is not a directory.
 
@@ -134,6 +138,9 @@ def _print_abbreviated_report(path):
 
     if os.path.islink(path):
         print("A link has no immutable attribute")
+    elif not os.path.isfile(path):
+        # A special file is not opened to read its attribute.
+        print("Immutable attribute could not be accessed")
     else:
         try:
             if utilities.file_is_immutable(path):
@@ -225,7 +232,7 @@ def _print_report_line(label, value=None):
     else:
         value_width = constants.TABLE_WIDTH - (len(label) + 1)
         print(label, value.rjust(value_width))
-    print("-" * constants.TABLE_WIDTH)
+    print(constants.TABLE_SEPARATOR)
 
 
 def _stringify_int(integer):
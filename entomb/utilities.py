@@ -1,7 +1,10 @@
-import datetime
-import decimal
+import concurrent.futures
+import fcntl
+import itertools
 import os
-import subprocess
+import struct
+import sys
+import time
 from contextlib import contextmanager
 
 from entomb import (
@@ -10,59 +13,144 @@ from entomb import (
 )
 
 
+# Progress messages and cursor control sequences are only printed to a
+# terminal, as they rely on being overwritten and are noise when output is
+# redirected to a file or piped to another command. Standard output is checked
+# once, as checking takes a system call and the answer doesn't change.
+_STDOUT_IS_A_TERMINAL = sys.stdout.isatty()
+
+
 def clear_line():
     """Clear the current line in the terminal.
 
+    Nothing is printed if standard output is not a terminal.
+
     Returns
     -------
     None
 
     """
-    print("\033[K", end="")
+    if _STDOUT_IS_A_TERMINAL:
+        print("\033[K", end="")
 
 
-def count_file_paths(path, include_git, print_frequency=1000):
-    """Count the file paths in a directory.
+def collect_paths(paths, limit, print_frequency=1000):
+    """Collect the first paths and path types generated by a walk.
 
-    Prints the file path count as it progresses.
+    Prints the file path count as it progresses, if standard output is a
+    terminal. If the walk finishes before the limit is reached, the collected
+    paths allow an operation to know its total file path count without
+    walking the path a second time.
 
     Parameters
     ----------
-    path : str
-        An absolute path.
-    include_git: bool
-        Whether to include git files.
+    paths : iterator of tuple of (str, str)
+        The paths and path types generated by walk_path(). Those which are
+        collected are consumed, so the rest can be taken from the iterator.
+    limit : int
+        The maximum number of paths to collect.
     print_frequency : int, optional
         The number of file paths to count before re-printing the count. The
         default is 1000.
 
     Returns
     -------
-    int
-        The number of file paths in the directory and its subdirectories.
+    list of tuple of (str, str)
+        Each collected absolute path and its path type, in the order they were
+        walked.
 
     """
-    print("Counting file paths: 0", end="\r")
+    # Only print the count if it can be overwritten.
+    print_count = _STDOUT_IS_A_TERMINAL
+    if print_count:
+        print("Counting file paths: 0", end="\r")
 
     count = 0
+    collected_paths = []
 
     # Walk the path.
-    for _ in file_paths(path, include_git):
-        count += 1
+    for path_and_type in itertools.islice(paths, limit):
+        collected_paths.append(path_and_type)
 
-        # Only print the count at the specified frequency.
-        if count % print_frequency == 0:
-            print("Counting file paths: {:,}".format(count), end="\r")
+        # Only count and print files and links.
+        if path_and_type[1] != constants.DIRECTORY:
+            count += 1
+            if print_count and count % print_frequency == 0:
+                print("Counting file paths: {:,}".format(count), end="\r")
 
     # Clear the final count message.
     clear_line()
 
-    return count
+    return collected_paths
+
+
+def examine_paths(path, include_git, examine, jobs, redraw_after=None):
+    """Examine the files on a path using a pool of threads.
+
+    Prints a progress bar as the paths are examined. As each update is written
+    to the terminal, the bar is updated every hundred paths, or about 500 times
+    in all on a large path, rather than after every path. On a path too large
+    to hold in memory at once, only the count of examined file paths is shown.
+
+    Parameters
+    ----------
+    path : str
+        An absolute path.
+    include_git: bool
+        Whether to include git files.
+    examine : callable
+        A function which takes the absolute path of a file. As it is applied
+        in a pool of threads, it should return rather than raise an error.
+    jobs : int
+        The number of files to examine at once.
+    redraw_after : callable, optional
+        A function which takes the result of examining a file, and returns
+        whether to re-print the progress bar straight after the file, for
+        instance because the caller prints over the bar. The default is None,
+        for which the bar is only re-printed at the print frequency.
+
+    Yields
+    ------
+    tuple of (str, str, object)
+        Each absolute path on the path, its path type, and the result of
+        examining it if it is a file or None if it is not, in the order the
+        paths were walked.
+
+    """
+    # Walk the start of the path. If the whole path is walked, its file paths
+    # are counted from the collected paths. Otherwise, rather than holding
+    # every path in memory or walking the path a second time to count them,
+    # the rest of the walk is examined as it is generated, and the progress
+    # bar shows only the count of examined file paths.
+    walk = walk_path(path, include_git)
+    collected_paths = collect_paths(walk, constants.READ_AHEAD_LIMIT)
+    total = None
+    if len(collected_paths) < constants.READ_AHEAD_LIMIT:
+        total = sum(
+            1
+            for _, path_type in collected_paths
+            if path_type != constants.DIRECTORY
+        )
+
+    yield from _examine_walked_paths(
+        itertools.chain(collected_paths, walk),
+        examine,
+        jobs,
+        total,
+        redraw_after,
+    )
 
 
 def file_is_immutable(path):
     """Whether a file has the immutable attribute set.
 
+    The path is not checked before its immutable attribute is read, as this is
+    called for every file examined. A link or a path which does not exist,
+    perhaps because its file was deleted after the path was walked, is
+    reported as having an immutable attribute which cannot be accessed. As
+    the file is opened to read its attribute, this should only be called for
+    a regular file, and not for a special file such as a device node.
+
     Parameters
     ----------
     path : str
@@ -75,83 +163,120 @@ def file_is_immutable(path):
 
     Raises
     ------
-    AssertionError
-        If the path is a directory, is a link or does not exist.
     GetAttributeError
         If the path's immutable attribute cannot be accessed.
 
     """
-    # Parameter check.
-    assert not os.path.isdir(path)
-    assert not os.path.islink(path)
-    assert os.path.exists(path)
-
     # Get the immutable flag.
     immutable_flag = _get_immutable_flag(path)
 
     return immutable_flag == "i"
 
 
-def file_paths(path, include_git):
-    """Generate paths of all files and links on the path.
+@contextmanager
+def hide_cursor():
+    """Hide the cursor and then finally show it again.
+
+    Used as a decorator to hide the cursor when a function starts and
+    show the cursor again when the function finishes or an exception occurs.
+    Nothing is printed if standard output is not a terminal.
+
+    Yields
+    ------
+    None
+
+    """
+    # Hide the cursor, if there is one.
+    if _STDOUT_IS_A_TERMINAL:
+        print("\033[?25l", end="")
+    try:
+        yield
+    finally:
+        # Show the cursor.
+        if _STDOUT_IS_A_TERMINAL:
+            print("\033[?25h", end="")
+
+
+@contextmanager
+def inode_flags(path):
+    """Open a file and read its inode flags, then finally close it.
+
+    The file is opened without following links or blocking on special files.
+    The flags are read with the FS_IOC_GETFLAGS ioctl call, which is also how
+    lsattr and chattr read them.
 
     Parameters
     ----------
     path : str
         An absolute path.
-    include_git: bool
-        Whether to include git files.
 
     Yields
     ------
-    str
-        An absolute path.
+    tuple of (int, int)
+        The open file descriptor, which can be used to change the flags, and
+        the flags.
 
     Raises
     ------
-    AssertionError
-        If the path does not exist.
+    OSError
+        If the file cannot be opened or its flags cannot be read.
 
     """
-    # Parameter check.
-    # Note that this assert statement appears to only raise an AssertionError
-    # when the generator is iterated, not when it is created.
-    assert os.path.exists(path)
-
-    # Yield the path if the path is not to a directory.
-    if not os.path.isdir(path):
-        yield path
-
-    # Walk the path if the path is to a directory.
-    for root_dir, dirnames, filenames in os.walk(path):
-
-        # Exclude git files and directories if directed.
-        if not include_git:
-            dirnames[:] = [d for d in dirnames if d != ".git"]
+    open_flags = os.O_RDONLY | os.O_NONBLOCK | os.O_NOFOLLOW
+    file_descriptor = os.open(path, open_flags)
+    try:
+        result = fcntl.ioctl(
+            file_descriptor,
+            constants.FS_IOC_GETFLAGS,
+            struct.pack("i", 0),
+        )
+        yield file_descriptor, struct.unpack("i", result)[0]
+    finally:
+        os.close(file_descriptor)
 
-        for filename in filenames:
-            yield os.path.join(root_dir, filename)
 
+def map_in_threads(function, items, thread_count, chunk_size=256):
+    """Apply a function to each item using a pool of threads.
 
-@contextmanager
-def hide_cursor():
-    """Hide the cursor and then finally show it again.
+    This suits a function which spends most of its time waiting on the
+    operating system. Items are submitted to the pool a chunk at a time, with
+    the next chunk submitted while the results of the current one are yielded,
+    so that an interrupted operation only waits for two chunks to finish.
 
-    Used as a decorator to hide the cursor when a function starts and
-    show the cursor again when the function finishes or an exception occurs.
+    Parameters
+    ----------
+    function : callable
+        A function which takes a single item.
+    items : iterable
+        The items to apply the function to.
+    thread_count : int
+        The number of threads in the pool.
+    chunk_size : int, optional
+        The number of items to submit to the pool at a time. The default is
+        256.
 
     Yields
     ------
-    None
+    object
+        The result of applying the function to each item, in the same order as
+        the items.
 
     """
-    # Hide the cursor.
-    print("\033[?25l", end="")
-    try:
-        yield
-    finally:
-        # Show the cursor.
-        print("\033[?25h", end="")
+    items = iter(items)
+
+    with concurrent.futures.ThreadPoolExecutor(thread_count) as executor:
+        futures = [
+            executor.submit(function, item)
+            for item in itertools.islice(items, chunk_size)
+        ]
+        while futures:
+            next_futures = [
+                executor.submit(function, item)
+                for item in itertools.islice(items, chunk_size)
+            ]
+            for future in futures:
+                yield future.result()
+            futures = next_futures
 
 
 def print_header(header):
@@ -176,12 +301,14 @@ def print_progress_bar(start_time, count, total, print_frequency=100):
 
     Parameters
     ----------
-    start_time : datetime
-        When the operation being reported on began.
+    start_time : float
+        When the operation being reported on began, as a time.monotonic()
+        value.
     count : int
         The number of cycles completed.
-    total : int
-        The total number of cycles to complete.
+    total : int or None
+        The total number of cycles to complete, or None if it is not known
+        yet, in which case only the count is printed.
     print_frequency : int, optional
         The number of cycles to complete before re-printing the count. The
         default is 100.
@@ -192,31 +319,138 @@ def print_progress_bar(start_time, count, total, print_frequency=100):
 
     """
     # Print the progress bar at the specified frequency or when the operation
-    # is finished.
+    # is finished, unless standard output is not a terminal, in which case the
+    # bar couldn't be overwritten.
     is_finished = count == total
     update_now = count % print_frequency == 0
 
-    if is_finished or update_now:
-
-        # Build the progress bar.
-        progress_bar = _build_progress_bar(count, total)
-        progress_bar = _add_percentage_to_progress_bar(
-            progress_bar,
-            count,
-            total,
-        )
-        progress_bar = _add_time_to_progress_bar(
-            progress_bar,
-            start_time,
-            count,
-            total,
-        )
+    if (is_finished or update_now) and _STDOUT_IS_A_TERMINAL:
+
+        # Build the progress bar, or just the count if there is no total.
+        if total is None:
+            progress_bar = "{:,} file paths examined".format(count)
+        else:
+            progress_bar = _build_progress_bar(count, total)
+            progress_bar = _add_percentage_to_progress_bar(
+                progress_bar,
+                count,
+                total,
+            )
+            progress_bar = _add_time_to_progress_bar(
+                progress_bar,
+                start_time,
+                count,
+                total,
+            )
 
         # Print the progress bar.
         clear_line()
         print(progress_bar, end="\r")
 
 
+@contextmanager
+def progress_section():
+    """Print a progress header, then finally move on from the progress bar.
+
+    The blank lines after the finished progress bar keep it apart from what
+    follows. Nothing is printed if standard output is not a terminal, as the
+    progress bar isn't either.
+
+    Yields
+    ------
+    None
+
+    """
+    # Only print the section if the progress bar will be printed in it.
+    if _STDOUT_IS_A_TERMINAL:
+        print_header("Progress")
+    yield
+    if _STDOUT_IS_A_TERMINAL:
+        print()
+        print()
+
+
+def walk_path(path, include_git):
+    """Generate the paths and path types of everything on the path.
+
+    Each directory is read with a single scandir call, and the type of each of
+    its entries is taken from that call rather than from a separate stat call
+    per entry. Each directory's entries are visited in inode number order, so
+    that examining them reads the inode table in sequence rather than jumping
+    around it. Directories are visited top-down, each directory before its
+    entries, and links to directories are not followed.
+
+    Parameters
+    ----------
+    path : str
+        An absolute path.
+    include_git: bool
+        Whether to include git files.
+
+    Yields
+    ------
+    tuple of (str, str)
+        An absolute path and its path type, which is either a directory, a
+        file, a link or a special file.
+
+    Raises
+    ------
+    AssertionError
+        If the path does not exist.
+
+    """
+    # Parameter check.
+    # Note that this assert statement appears to only raise an AssertionError
+    # when the generator is iterated, not when it is created.
+    assert os.path.exists(path)
+
+    # Yield the path if the path is not to a directory.
+    if not os.path.isdir(path):
+        if os.path.islink(path):
+            path_type = constants.LINK
+        elif os.path.isfile(path):
+            path_type = constants.FILE
+        else:
+            path_type = constants.SPECIAL_FILE
+        yield path, path_type
+        return
+
+    # Walk the path if the path is to a directory. Subdirectories are pushed
+    # onto the stack in reverse so that they are popped off it in order.
+    directory_paths = [path]
+    while directory_paths:
+        directory_path = directory_paths.pop()
+
+        # Skip directories which can't be read, as os.walk does.
+        try:
+            entries = list(os.scandir(directory_path))
+        except OSError:
+            continue
+
+        # The inode number is read from the directory listing on Linux, so
+        # sorting by it costs no extra system calls.
+        entries.sort(key=lambda entry: entry.inode())
+
+        yield directory_path, constants.DIRECTORY
+
+        subdirectory_paths = []
+        for entry in entries:
+            if _entry_is_directory(entry):
+                # Exclude git directories if directed, and don't follow links
+                # to directories.
+                is_excluded = not include_git and entry.name == ".git"
+                if not is_excluded and not entry.is_symlink():
+                    subdirectory_paths.append(entry.path)
+            elif entry.is_symlink():
+                yield entry.path, constants.LINK
+            elif _entry_is_file(entry):
+                yield entry.path, constants.FILE
+            else:
+                yield entry.path, constants.SPECIAL_FILE
+
+        directory_paths.extend(reversed(subdirectory_paths))
+
+
 def _add_percentage_to_progress_bar(progress_bar, count, total):
     """Add the percentage to the progress bar.
 
@@ -238,14 +472,11 @@ def _add_percentage_to_progress_bar(progress_bar, count, total):
     operation_is_not_finished = count != total
 
     if operation_is_not_finished:
-        progress = count / total if total > 0 else 1
-        percentage = progress * 100
-        # Round the percentage down so that it is never shown as 100% before
-        # the operation is finished.
-        rounded_percentage = decimal.Decimal(percentage).quantize(
-            decimal.Decimal("0.0"), rounding=decimal.ROUND_DOWN,
-        )
-        progress_bar += "  {}%".format(rounded_percentage)
+        # Work in tenths of a percent with integer division, which rounds the
+        # percentage down so that it is never shown as 100% before the
+        # operation is finished.
+        tenths = count * 1000 // total if total > 0 else 1000
+        progress_bar += "  {}.{}%".format(tenths // 10, tenths % 10)
 
     return progress_bar
 
@@ -257,8 +488,9 @@ def _add_time_to_progress_bar(progress_bar, start_time, count, total):
     ----------
     progress_bar : str
         The bar component of the progress bar, as built so far.
-    start_time : datetime
-        When the operation being reported on began.
+    start_time : float
+        When the operation being reported on began, as a time.monotonic()
+        value.
     count : int
         The number of cycles completed.
     total : int
@@ -271,8 +503,7 @@ def _add_time_to_progress_bar(progress_bar, start_time, count, total):
 
     """
     operation_is_not_finished = count != total
-    time_elapsed = datetime.datetime.now() - start_time
-    seconds_elapsed = time_elapsed.total_seconds()
+    seconds_elapsed = time.monotonic() - start_time
     show_time_remaining = seconds_elapsed > 2 and operation_is_not_finished
 
     if show_time_remaining:
@@ -308,11 +539,129 @@ def _build_progress_bar(count, total):
     return ("█" * progress_width).ljust(bar_width, "░")
 
 
+def _entry_is_directory(entry):
+    """Determine whether a directory entry is a directory or a link to one.
+
+    Parameters
+    ----------
+    entry : os.DirEntry
+        An entry from a directory scan.
+
+    Returns
+    -------
+    bool
+        Whether the entry is a directory or a link to a directory.
+
+    """
+    # Treat an entry which can't be examined as a file, as os.walk does.
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _entry_is_file(entry):
+    """Determine whether a directory entry is a regular file.
+
+    Parameters
+    ----------
+    entry : os.DirEntry
+        An entry from a directory scan, which is not a link.
+
+    Returns
+    -------
+    bool
+        Whether the entry is a regular file, rather than a special file such
+        as a device node, named pipe or socket.
+
+    """
+    # Treat an entry which can't be examined as a special file, so that it
+    # isn't opened.
+    try:
+        return entry.is_file(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def _examine_walked_paths(paths, examine, jobs, total, redraw_after):
+    """Examine walked paths using a pool of threads, printing a progress bar.
+
+    Parameters
+    ----------
+    paths : iterator of tuple of (str, str)
+        Paths and path types, as generated by walk_path().
+    examine : callable
+        A function which takes the absolute path of a file.
+    jobs : int
+        The number of files to examine at once.
+    total : int or None
+        The total file path count, or None if it is not known, in which case
+        only the count of examined file paths is printed, every thousand file
+        paths.
+    redraw_after : callable or None
+        A function which takes the result of examining a file, and returns
+        whether to re-print the progress bar straight after the file.
+
+    Yields
+    ------
+    tuple of (str, str, object)
+        Each path, its path type, and the result of examining it if it is a
+        file or None if it is not.
+
+    """
+    start_time = time.monotonic()
+    print_frequency = 1000 if total is None else max(100, total // 500)
+    print_progress_bar(start_time, 0, total)
+
+    # Examining a file mostly means waiting on the operating system, so the
+    # files are examined in a pool of threads, in the order they were walked.
+    # The examined paths are only held until the results catch up with them.
+    paths, paths_to_examine = itertools.tee(paths)
+    examinations = map_in_threads(
+        examine,
+        (
+            file_path
+            for file_path, path_type in paths_to_examine
+            if path_type == constants.FILE
+        ),
+        jobs,
+    )
+
+    count = 0
+    for file_path, path_type in paths:
+        if path_type == constants.DIRECTORY:
+            yield file_path, path_type, None
+            continue
+
+        # The files and their examinations are taken from the same walk, so
+        # there is always an examination for a file. A default is given only
+        # so that running out of examinations can't stop this generator with
+        # a StopIteration, which Python turns into a RuntimeError.
+        result = None
+        if path_type == constants.FILE:
+            result = next(examinations, None)
+        yield file_path, path_type, result
+
+        # Update the progress bar.
+        count += 1
+        redraw = redraw_after is not None and redraw_after(result)
+        print_progress_bar(
+            start_time,
+            count,
+            total,
+            1 if redraw else print_frequency,
+        )
+
+    # Finish the progress bar if the total wasn't known.
+    if total is None:
+        print_progress_bar(start_time, count, count)
+
+
 def _get_immutable_flag(path):
     """Get the immutable flag of a file.
 
-    This function assumes that the path has already been confirmed to reference
-    a file.
+    The flag is read with the same ioctl call that lsattr uses, rather than by
+    running lsattr. Links are not followed, so a link's flags cannot be read.
 
     Parameters
     ----------
@@ -327,25 +676,16 @@ def _get_immutable_flag(path):
     Raises
     ------
     GetAttributeError
-        If the exit status of the lsattr command is non-zero.
+        If the file's flags cannot be read.
 
     """
     try:
-        lsattr_result = subprocess.run(
-            ["lsattr", path],
-            check=True,
-            stderr=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            universal_newlines=True,
-        )
-    except subprocess.CalledProcessError:
+        with inode_flags(path) as (_, flags):
+            immutable_flag = "i" if flags & constants.FS_IMMUTABLE_FL else "-"
+    except OSError:
         msg = "Immutable attribute could not be accessed for {}".format(path)
         raise exceptions.GetAttributeError(msg)
 
-    # Extract the immutable attribute from the command output.
-    attributes = lsattr_result.stdout.split()[0]
-    immutable_flag = list(attributes)[4]
-
     return immutable_flag
 
 
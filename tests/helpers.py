@@ -2,6 +2,7 @@ import contextlib
 import os
 import shutil
 import subprocess
+import unittest.mock as mock
 
 from tests import constants
 
@@ -41,6 +42,63 @@ def file_is_immutable(path):
     return immutable_flag == "i"
 
 
+def listed_output(calls):
+    """Reduce the print calls made while listing files to their listed output.
+
+    The progress messages and bars, and the line clearing around them, are
+    removed, as when the progress bar is redrawn depends on where the listed
+    files fall in the walk. Each run of listed paths is sorted, as the order
+    in which a directory's entries are walked depends on their inode numbers,
+    which the filesystem allocates.
+
+    Parameters
+    ----------
+    calls : list of unittest.mock.call
+        The calls made to print().
+
+    Returns
+    -------
+    list of unittest.mock.call
+        The calls without progress output, with listed paths sorted.
+
+    """
+    listed_calls = []
+    paths = []
+    for call in calls:
+        _, args, kwargs = call
+        if kwargs.get("end") == "\r" or args == ("\033[K",):
+            continue
+        if len(args) == 1 and args[0].startswith(constants.DIRECTORY_PATH):
+            paths.append(call)
+            continue
+        listed_calls.extend(sorted(paths, key=str))
+        paths = []
+        listed_calls.append(call)
+    listed_calls.extend(sorted(paths, key=str))
+
+    return listed_calls
+
+
+def patch_stdout_is_a_terminal(is_a_terminal):
+    """Patch whether standard output is treated as a terminal.
+
+    Parameters
+    ----------
+    is_a_terminal : bool
+        Whether standard output is to be treated as a terminal.
+
+    Returns
+    -------
+    unittest.mock._patch
+        A patcher, which can be used as a context manager.
+
+    """
+    return mock.patch(
+        "entomb.utilities._STDOUT_IS_A_TERMINAL",
+        is_a_terminal,
+    )
+
+
 def set_file_immutable_attribute(path, immutable):
     """Set or unset the immutable attribute for a file.
 
@@ -81,6 +139,10 @@ def set_up():
     # Ensure that tests start with a clean slate.
     tear_down()
 
+    # Behave as though standard output is a terminal, so that progress
+    # messages and cursor control sequences are printed.
+    patch_stdout_is_a_terminal(True).start()
+
     # Create testing directories.
     os.makedirs(constants.EMPTY_SUBDIRECTORY_PATH)
     os.makedirs(constants.GIT_SUBDIRECTORY_PATH)
@@ -128,6 +190,10 @@ def tear_down():
     None
 
     """
+    # Stop treating standard output as a terminal, along with any other
+    # patches which were started.
+    mock.patch.stopall()
+
     # Ensure all testing files are mutable, or they won't able to be deleted.
     for root_dir, _, filenames in os.walk(constants.DIRECTORY_PATH):
         for filename in filenames:
@@ -136,31 +136,7 @@ class TestCore(unittest.TestCase):
             mock.call(),
             mock.call("Immutable files"),
             mock.call("---------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/subdirectory/immutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░  33.3%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████████████████████░░░░░░░░░░░░░░  66.6%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -169,7 +145,10 @@ class TestCore(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test printing a list of mutable files including git files.
         with mock.patch("builtins.print") as mocked_print:
@@ -195,72 +174,10 @@ class TestCore(unittest.TestCase):
             mock.call(),
             mock.call("Mutable files"),
             mock.call("-------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  10.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  20.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call("/tmp/entomb_testing/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░  30.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████░░░░░░░░░░░░░░░░░░░░░░░░  40.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/.git/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████░░░░░░░░░░░░░░░░  60.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/.git/subdirectory/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████░░░░░░░░░░░░  70.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████░░░░░░░░  80.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████░░░░  90.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
+            mock.call("/tmp/entomb_testing/mutable.txt"),
             mock.call("/tmp/entomb_testing/subdirectory/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -269,7 +186,10 @@ class TestCore(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test a dry run for making all files in a directory immutable.
         with mock.patch("builtins.print") as mocked_print:
@@ -564,6 +484,7 @@ class TestCore(unittest.TestCase):
         expected = argparse.Namespace(
             dry_run=False,
             include_git=False,
+            jobs=8,
             list_immutable=False,
             list_mutable=False,
             path=constants.DIRECTORY_PATH,
@@ -579,6 +500,7 @@ class TestCore(unittest.TestCase):
         expected = argparse.Namespace(
             dry_run=False,
             include_git=False,
+            jobs=8,
             list_immutable=True,
             list_mutable=False,
             path=constants.LINK_PATH,
@@ -587,6 +509,22 @@ class TestCore(unittest.TestCase):
         )
         self.assertEqual(actual, expected)
 
+        # Test a file path with --jobs.
+        actual = core._parse_args(
+            [EXECUTABLE, constants.MUTABLE_FILE_PATH, "--jobs", "32"],
+        )
+        expected = argparse.Namespace(
+            dry_run=False,
+            include_git=False,
+            jobs=32,
+            list_immutable=False,
+            list_mutable=False,
+            path=constants.MUTABLE_FILE_PATH,
+            report=False,
+            unset=False,
+        )
+        self.assertEqual(actual, expected)
+
         # Test --version without a path.
         output = io.StringIO
         with mock.patch("sys.stdout", new_callable=output) as mocked_stdout:
@@ -598,6 +536,19 @@ class TestCore(unittest.TestCase):
         actual = mocked_stdout.getvalue()
         self.assertRegex(actual, r"^Entomb \d+\.\d+\.\d+\n$")
 
+    def test__positive_integer(self):
+        """Test the _positive_integer function.
+
+        """
+        self.assertEqual(core._positive_integer("1"), 1)
+        self.assertEqual(core._positive_integer("16"), 16)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            core._positive_integer("0")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            core._positive_integer("-4")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            core._positive_integer("four")
+
     def test__print_argument_conflict_errors(self):
         """Test the _print_argument_conflict_errors function.
 
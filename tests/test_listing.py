@@ -1,3 +1,4 @@
+import os
 import unittest
 import unittest.mock as mock
 
@@ -36,58 +37,8 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Immutable files"),
             mock.call("---------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/immutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  12.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  25.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████░░░░░░░░░░░░░░░░░░░░░░░░░  37.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████████████████████████░░░░░░░░░░░░░░░  62.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/subdirectory/immutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████████████████████████░░░░░░░░░░  75.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████████████████████████░░░░░  87.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -96,7 +47,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test immutable files including git.
         with mock.patch("builtins.print") as mocked_print:
@@ -111,68 +65,8 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Immutable files"),
             mock.call("---------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/immutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  10.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  20.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░  30.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████░░░░░░░░░░░░░░░░░░░░░░░░  40.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████░░░░░░░░░░░░░░░░  60.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████░░░░░░░░░░░░  70.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/subdirectory/immutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████░░░░░░░░  80.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████░░░░  90.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -181,7 +75,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test mutable files excluding git.
         with mock.patch("builtins.print") as mocked_print:
@@ -196,58 +93,8 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Mutable files"),
             mock.call("-------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  12.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  25.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████░░░░░░░░░░░░░░░░░░░░░░░░░  37.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████████████████████████░░░░░░░░░░░░░░░  62.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████████████████████████░░░░░░░░░░  75.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████████████████████████░░░░░  87.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/subdirectory/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -256,7 +103,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test mutable files including git.
         with mock.patch("builtins.print") as mocked_print:
@@ -271,72 +121,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Mutable files"),
             mock.call("-------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  10.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  20.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call("/tmp/entomb_testing/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░  30.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████░░░░░░░░░░░░░░░░░░░░░░░░  40.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/.git/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████░░░░░░░░░░░░░░░░  60.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("/tmp/entomb_testing/.git/subdirectory/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████░░░░░░░░░░░░  70.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████░░░░░░░░  80.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████░░░░  90.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
+            mock.call("/tmp/entomb_testing/mutable.txt"),
             mock.call("/tmp/entomb_testing/subdirectory/mutable.txt"),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call(),
             mock.call("Summary"),
             mock.call("-------"),
@@ -345,7 +133,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test mutable files excluding git after making all files immutable.
         helpers.set_file_immutable_attribute(
@@ -372,54 +163,6 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Mutable files"),
             mock.call("-------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  12.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  25.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████░░░░░░░░░░░░░░░░░░░░░░░░░  37.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████░░░░░░░░░░░░░░░░░░░░  50.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "█████████████████████████░░░░░░░░░░░░░░░  62.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "██████████████████████████████░░░░░░░░░░  75.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "███████████████████████████████████░░░░░  87.5%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("-"),
             mock.call(),
             mock.call("Summary"),
@@ -429,7 +172,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test for a non-existent path.
         with self.assertRaises(AssertionError):
@@ -452,19 +198,6 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Mutable files"),
             mock.call("-------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("-"),
             mock.call(),
             mock.call("Summary"),
@@ -474,7 +207,10 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
 
         # Test a file which is readable only by root.
         with mock.patch("builtins.print") as mocked_print:
@@ -489,19 +225,6 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("Immutable files"),
             mock.call("---------------"),
-            mock.call("Counting file paths: 0", end="\r"),
-            mock.call("\033[K", end=""),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
-            mock.call(
-                "████████████████████████████████████████",
-                end="\r",
-            ),
-            mock.call("\033[K", end=""),
             mock.call("-"),
             mock.call(),
             mock.call("Summary"),
@@ -511,7 +234,31 @@ class TestListing(unittest.TestCase):
             mock.call(),
             mock.call("\033[?25h", end=""),
         ]
-        self.assertEqual(mocked_print.mock_calls, expected)
+        self.assertEqual(
+            helpers.listed_output(mocked_print.mock_calls),
+            expected,
+        )
+
+        # Test that the progress bar is not updated after every file in a
+        # large directory.
+        for i in range(1000):
+            file_path = os.path.join(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                "{}.txt".format(i),
+            )
+            open(file_path, "x").close()
+        with mock.patch("builtins.print") as mocked_print:
+            listing.list_files(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                immutable=True,
+                include_git=False,
+            )
+        progress_bar_calls = [
+            c for c in mocked_print.mock_calls if "░" in str(c)
+        ]
+        # The unfinished progress bar is printed once at the start, then after
+        # every hundredth file until the last.
+        self.assertEqual(len(progress_bar_calls), 10)
 
     def test__print_the_path(self):
         """Test the _print_the_path function.
@@ -541,15 +288,15 @@ class TestListing(unittest.TestCase):
                 immutable=False,
             ),
         )
-        with self.assertRaises(AssertionError):
+        self.assertFalse(
             listing._print_the_path(
                 constants.NON_EXISTENT_PATH,
                 immutable=True,
-            )
-        with self.assertRaises(AssertionError):
-            listing._print_the_path(constants.DIRECTORY_PATH, immutable=False)
-        with self.assertRaises(AssertionError):
-            listing._print_the_path(constants.LINK_PATH, immutable=True)
+            ),
+        )
+        self.assertFalse(
+            listing._print_the_path(constants.LINK_PATH, immutable=False),
+        )
 
     def tearDown(self):
         """Delete temporary directories and files.
@@ -1,5 +1,7 @@
+import collections
 import contextlib
 import os
+import struct
 import subprocess
 import unittest
 import unittest.mock as mock
@@ -258,14 +260,18 @@ class TestProcessing(unittest.TestCase):
                 dry_run=False,
             )
 
-        # Test a named pipe.
-        with mock.patch("builtins.print") as mocked_print:
-            processing.process_objects(
-                constants.NAMED_PIPE_PATH,
-                immutable=False,
-                include_git=True,
-                dry_run=False,
-            )
+        # Test a named pipe, which is never opened, even with root privileges,
+        # as opening a special file can have side effects.
+        with mock.patch("os.geteuid", return_value=0):
+            with mock.patch("os.open", wraps=os.open) as mocked_open:
+                with mock.patch("builtins.print") as mocked_print:
+                    processing.process_objects(
+                        constants.NAMED_PIPE_PATH,
+                        immutable=False,
+                        include_git=True,
+                        dry_run=False,
+                    )
+        mocked_open.assert_not_called()
         expected = [
             mock.call("\033[?25l", end=""),
             mock.call("Unset objects"),
@@ -359,6 +365,333 @@ class TestProcessing(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
+        # Test that the progress bar is not updated after every file in a
+        # large directory.
+        for i in range(1000):
+            file_path = os.path.join(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                "{}.txt".format(i),
+            )
+            open(file_path, "x").close()
+        with mock.patch("builtins.print") as mocked_print:
+            processing.process_objects(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                immutable=True,
+                include_git=False,
+                dry_run=True,
+            )
+        progress_bar_calls = [
+            c for c in mocked_print.mock_calls if "░" in str(c)
+        ]
+        # The unfinished progress bar is printed once at the start, then after
+        # every hundredth file until the last.
+        self.assertEqual(len(progress_bar_calls), 10)
+
+        # Test that neither the progress section nor the blank lines after it
+        # are printed if standard output is not a terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                processing.process_objects(
+                    constants.EMPTY_SUBDIRECTORY_PATH,
+                    immutable=True,
+                    include_git=False,
+                    dry_run=True,
+                )
+        expected = [
+            mock.call("Entomb objects"),
+            mock.call(),
+            mock.call("Changes"),
+            mock.call("-------"),
+            mock.call("Entombed 1000 files"),
+            mock.call(),
+            mock.call("Summary"),
+            mock.call("-------"),
+            mock.call(
+                "All 1000 files for which immutability can be set are now "
+                "entombed",
+            ),
+            mock.call("All 0 links were ignored"),
+            mock.call(),
+        ]
+        self.assertEqual(mocked_print.mock_calls, expected)
+
+    def test__attribute_needs_changing(self):
+        """Test the _attribute_needs_changing function.
+
+        """
+        # Test a mutable file.
+        self.assertTrue(
+            processing._attribute_needs_changing(
+                constants.MUTABLE_FILE_PATH,
+                immutable=True,
+            ),
+        )
+        self.assertFalse(
+            processing._attribute_needs_changing(
+                constants.MUTABLE_FILE_PATH,
+                immutable=False,
+            ),
+        )
+
+        # Test an immutable file.
+        self.assertFalse(
+            processing._attribute_needs_changing(
+                constants.IMMUTABLE_FILE_PATH,
+                immutable=True,
+            ),
+        )
+        self.assertTrue(
+            processing._attribute_needs_changing(
+                constants.IMMUTABLE_FILE_PATH,
+                immutable=False,
+            ),
+        )
+
+        # Test that the file's attribute is not changed.
+        self.assertFalse(
+            helpers.file_is_immutable(constants.MUTABLE_FILE_PATH),
+        )
+        self.assertTrue(
+            helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
+        )
+
+        # Test a named pipe.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._attribute_needs_changing(
+                constants.NAMED_PIPE_PATH,
+                immutable=True,
+            )
+
+        # Test a link.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._attribute_needs_changing(
+                constants.LINK_PATH,
+                immutable=True,
+            )
+
+        # Test a non-existent path.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._attribute_needs_changing(
+                constants.NON_EXISTENT_PATH,
+                immutable=False,
+            )
+
+    def test__change_attributes(self):
+        """Test the _change_attributes function.
+
+        """
+        # Without root privileges, chattr is run through sudo.
+        with mock.patch("os.geteuid", return_value=1000):
+            # Test making mutable files immutable.
+            actual = processing._change_attributes(
+                [
+                    constants.MUTABLE_FILE_PATH,
+                    constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+                ],
+                immutable=True,
+                dry_run=False,
+            )
+            self.assertEqual(actual, (2, []))
+            self.assertTrue(
+                helpers.file_is_immutable(constants.MUTABLE_FILE_PATH),
+            )
+            self.assertTrue(
+                helpers.file_is_immutable(
+                    constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+                ),
+            )
+
+            # Test making immutable files mutable as a dry run.
+            actual = processing._change_attributes(
+                [
+                    constants.MUTABLE_FILE_PATH,
+                    constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+                ],
+                immutable=False,
+                dry_run=True,
+            )
+            self.assertEqual(actual, (2, []))
+            self.assertTrue(
+                helpers.file_is_immutable(constants.MUTABLE_FILE_PATH),
+            )
+
+            # Test a group of files which includes one which can't be changed.
+            changed_count, errors = processing._change_attributes(
+                [
+                    constants.MUTABLE_FILE_PATH,
+                    constants.NAMED_PIPE_PATH,
+                    constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+                ],
+                immutable=False,
+                dry_run=False,
+            )
+            self.assertEqual(changed_count, 2)
+            self.assertEqual(
+                [str(error) for error in errors],
+                [
+                    "Immutable attribute not settable for "
+                    "/tmp/entomb_testing/fifo",
+                ],
+            )
+            self.assertFalse(
+                helpers.file_is_immutable(constants.MUTABLE_FILE_PATH),
+            )
+            self.assertFalse(
+                helpers.file_is_immutable(
+                    constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+                ),
+            )
+
+            # Test no files.
+            actual = processing._change_attributes(
+                [],
+                immutable=True,
+                dry_run=False,
+            )
+            self.assertEqual(actual, (0, []))
+
+        # With root privileges, the flags are changed with ioctl calls rather
+        # than by running chattr. These calls are mocked, as they would only
+        # succeed if the tests were run with root privileges.
+        paths = [
+            constants.MUTABLE_FILE_PATH,
+            constants.NAMED_PIPE_PATH,
+            constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+        ]
+        pipe_error = exceptions.SetAttributeError("pipe error")
+        set_immutable_flag_patcher = mock.patch.object(
+            processing,
+            "_set_immutable_flag",
+            side_effect=[None, pipe_error, None],
+        )
+        with mock.patch("os.geteuid", return_value=0):
+            with mock.patch("subprocess.run") as mocked_run:
+                with set_immutable_flag_patcher as mocked_set_immutable_flag:
+                    actual = processing._change_attributes(
+                        paths,
+                        immutable=True,
+                        dry_run=False,
+                    )
+        self.assertEqual(actual, (2, [pipe_error]))
+        expected = [mock.call(path, True) for path in paths]
+        self.assertEqual(mocked_set_immutable_flag.mock_calls, expected)
+        mocked_run.assert_not_called()
+
+    def test__change_attributes_in_batches(self):
+        """Test the _change_attributes_in_batches function.
+
+        """
+        paths = ["/a", "/b", "/c", "/d", "/e"]
+        error = exceptions.SetAttributeError("Error for /d")
+
+        # Test that the paths are changed in batches, and that the changed
+        # counts and errors of the batches are combined.
+        change_attributes_patcher = mock.patch.object(
+            processing,
+            "_change_attributes",
+            side_effect=[(2, []), (1, [error]), (1, [])],
+        )
+        with mock.patch("entomb.constants.CHANGE_BATCH_SIZE", 2):
+            with change_attributes_patcher as mocked_change_attributes:
+                actual = processing._change_attributes_in_batches(
+                    iter(paths),
+                    immutable=True,
+                    dry_run=False,
+                )
+        self.assertEqual(actual, (4, [error]))
+        expected = [
+            mock.call(["/a", "/b"], True, False),
+            mock.call(["/c", "/d"], True, False),
+            mock.call(["/e"], True, False),
+        ]
+        self.assertEqual(mocked_change_attributes.mock_calls, expected)
+
+        # Test no paths.
+        change_attributes_patcher = mock.patch.object(
+            processing,
+            "_change_attributes",
+        )
+        with change_attributes_patcher as mocked_change_attributes:
+            actual = processing._change_attributes_in_batches(
+                [],
+                immutable=True,
+                dry_run=False,
+            )
+        self.assertEqual(actual, (0, []))
+        mocked_change_attributes.assert_not_called()
+
+    def test__examine_file(self):
+        """Test the _examine_file function.
+
+        """
+        # Test a mutable file.
+        actual = processing._examine_file(
+            constants.MUTABLE_FILE_PATH,
+            immutable=True,
+        )
+        self.assertEqual(actual, (True, None))
+
+        # Test an immutable file.
+        actual = processing._examine_file(
+            constants.IMMUTABLE_FILE_PATH,
+            immutable=True,
+        )
+        self.assertEqual(actual, (False, None))
+
+        # Test a named pipe, whose error is returned rather than raised.
+        needs_changing, error = processing._examine_file(
+            constants.NAMED_PIPE_PATH,
+            immutable=True,
+        )
+        self.assertFalse(needs_changing)
+        self.assertIsInstance(error, exceptions.SetAttributeError)
+
+    def test__files_to_change(self):
+        """Test the _files_to_change function.
+
+        """
+        error = exceptions.SetAttributeError("Error for /c")
+        examined_paths = [
+            ("/", "directory", None),
+            ("/a", "file", (True, None)),
+            ("/b", "file", (False, None)),
+            ("/c", "file", (False, error)),
+            ("/d", "link", None),
+            ("/e", "file", (True, None)),
+        ]
+        counts = collections.Counter()
+        errors = []
+        actual = list(
+            processing._files_to_change(examined_paths, counts, errors),
+        )
+        self.assertEqual(actual, ["/a", "/e"])
+        expected = {"directory": 1, "file": 4, "link": 1, "unchanged": 1}
+        self.assertEqual(counts, expected)
+        self.assertEqual(errors, [error])
+
+    def test__group_paths(self):
+        """Test the _group_paths function.
+
+        """
+        # Test paths which fit in one group.
+        paths = ["/a", "/b", "/c"]
+        actual = list(processing._group_paths(paths))
+        expected = [["/a", "/b", "/c"]]
+        self.assertEqual(actual, expected)
+
+        # Test paths which need to be split into groups, with a limit which
+        # fits two paths. Only half of the argument limit is used.
+        path_size = len("/a") + 1 + struct.calcsize("P")
+        with mock.patch("os.sysconf", return_value=path_size * 2 * 2):
+            actual = list(processing._group_paths(paths * 2))
+        expected = [["/a", "/b"], ["/c", "/a"], ["/b", "/c"]]
+        self.assertEqual(actual, expected)
+
+        # Test no paths.
+        actual = list(processing._group_paths([]))
+        expected = []
+        self.assertEqual(actual, expected)
+
     def test__print_errors(self):
         """Test the _print_errors function.
 
@@ -369,12 +702,12 @@ class TestProcessing(unittest.TestCase):
         expected = []
         self.assertEqual(mocked_print.mock_calls, expected)
 
-        # Test with three errors.
+        # Test with three errors, which are sorted.
         with mock.patch("builtins.print") as mocked_print:
             processing._print_errors([
-                "ERROR: Message 1",
                 "ERROR: Message 2",
                 "ERROR: Message 3",
+                "ERROR: Message 1",
             ])
         expected = [
             mock.call("Errors"),
@@ -386,147 +719,112 @@ class TestProcessing(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
-        # Test with 12 errors.
+        # Test with 12 errors, of which the first 10 are printed once sorted.
         with mock.patch("builtins.print") as mocked_print:
             processing._print_errors([
-                "ERROR: Message 1",
-                "ERROR: Message 2",
-                "ERROR: Message 3",
-                "ERROR: Message 4",
-                "ERROR: Message 5",
-                "ERROR: Message 6",
-                "ERROR: Message 7",
-                "ERROR: Message 8",
-                "ERROR: Message 9",
-                "ERROR: Message 10",
-                "ERROR: Message 11",
-                "ERROR: Message 12",
+                "ERROR: Message {:02d}".format(i) for i in range(12, 0, -1)
             ])
         expected = [
             mock.call("Errors"),
             mock.call("------"),
-            mock.call(">> ERROR: Message 1"),
-            mock.call(">> ERROR: Message 2"),
-            mock.call(">> ERROR: Message 3"),
-            mock.call(">> ERROR: Message 4"),
-            mock.call(">> ERROR: Message 5"),
-            mock.call(">> ERROR: Message 6"),
-            mock.call(">> ERROR: Message 7"),
-            mock.call(">> ERROR: Message 8"),
-            mock.call(">> ERROR: Message 9"),
+            mock.call(">> ERROR: Message 01"),
+            mock.call(">> ERROR: Message 02"),
+            mock.call(">> ERROR: Message 03"),
+            mock.call(">> ERROR: Message 04"),
+            mock.call(">> ERROR: Message 05"),
+            mock.call(">> ERROR: Message 06"),
+            mock.call(">> ERROR: Message 07"),
+            mock.call(">> ERROR: Message 08"),
+            mock.call(">> ERROR: Message 09"),
             mock.call(">> ERROR: Message 10"),
             mock.call(">> Plus 2 more errors"),
             mock.call(),
         ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
-    def test__process_object(self):
-        """Test the _process_object function.
+    def test__set_attribute(self):
+        """Test the _set_attribute function.
 
         """
-        # Test making a mutable file immutable, then return it to its original
-        # state.
-        processing._process_object(
-            constants.MUTABLE_FILE_PATH,
-            immutable=True,
-            dry_run=False,
-        )
-        self.assertTrue(helpers.file_is_immutable(constants.MUTABLE_FILE_PATH))
-        processing._process_object(
-            constants.MUTABLE_FILE_PATH,
-            immutable=False,
-            dry_run=False,
-        )
-
-        # Test making a mutable file mutable.
-        processing._process_object(
-            constants.MUTABLE_FILE_PATH,
-            immutable=False,
-            dry_run=False,
-        )
-        self.assertFalse(
-            helpers.file_is_immutable(constants.MUTABLE_FILE_PATH),
-        )
-
-        # Test making an immutable file mutable, then return it to its original
-        # state.
-        processing._process_object(
-            constants.IMMUTABLE_FILE_PATH,
-            immutable=False,
-            dry_run=False,
-        )
+        # Test making an immutable file mutable.
+        processing._set_attribute("-i", constants.IMMUTABLE_FILE_PATH)
         self.assertFalse(
             helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
         )
-        processing._process_object(
-            constants.IMMUTABLE_FILE_PATH,
-            immutable=True,
-            dry_run=False,
-        )
 
-        # Test making an immutable file immutable.
-        processing._process_object(
-            constants.IMMUTABLE_FILE_PATH,
-            immutable=True,
-            dry_run=False,
-        )
+        # Test making a mutable file immutable.
+        processing._set_attribute("+i", constants.IMMUTABLE_FILE_PATH)
         self.assertTrue(
             helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
         )
 
-        # Test making an immutable file mutable as a dry run.
-        processing._process_object(
-            constants.IMMUTABLE_FILE_PATH,
-            immutable=False,
-            dry_run=True,
+        # Test making a non-existent path to immutable.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._set_attribute("+i", constants.NON_EXISTENT_PATH)
+
+        # Test making several files immutable.
+        processing._set_attribute(
+            "+i",
+            constants.MUTABLE_FILE_PATH,
+            constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
         )
+        self.assertTrue(helpers.file_is_immutable(constants.MUTABLE_FILE_PATH))
         self.assertTrue(
-            helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
+            helpers.file_is_immutable(
+                constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
+            ),
         )
 
-        # Test making a link immutable.
-        with self.assertRaises(AssertionError):
-            processing._process_object(
-                constants.LINK_PATH,
-                immutable=True,
-                dry_run=False,
-            )
+    def test__set_immutable_flag(self):
+        """Test the _set_immutable_flag function.
 
-        # Test making a directory mutable.
-        with self.assertRaises(AssertionError):
-            processing._process_object(
-                constants.DIRECTORY_PATH,
-                immutable=False,
-                dry_run=False,
-            )
+        """
+        # Test a link, which has no flags of its own.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._set_immutable_flag(constants.LINK_PATH, immutable=True)
 
-        # Test making a non-existent path mutable.
-        with self.assertRaises(AssertionError):
-            processing._process_object(
+        # Test a path which does not exist.
+        with self.assertRaises(exceptions.SetAttributeError):
+            processing._set_immutable_flag(
                 constants.NON_EXISTENT_PATH,
-                immutable=False,
-                dry_run=False,
+                immutable=True,
             )
 
-    def test__set_attribute(self):
-        """Test the _set_attribute function.
-
-        """
-        # Test making an immutable file mutable.
-        processing._set_attribute("-i", constants.IMMUTABLE_FILE_PATH)
-        self.assertFalse(
-            helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
-        )
+        # Changing the flag needs root privileges, so the ioctl calls are
+        # mocked to test the flags which are set whatever the privileges.
+        # Another flag, 0x80000, is set to test that it is left alone.
 
         # Test making a mutable file immutable.
-        processing._set_attribute("+i", constants.IMMUTABLE_FILE_PATH)
-        self.assertTrue(
-            helpers.file_is_immutable(constants.IMMUTABLE_FILE_PATH),
-        )
+        with mock.patch("fcntl.ioctl") as mocked_ioctl:
+            mocked_ioctl.return_value = struct.pack("i", 0x80000)
+            processing._set_immutable_flag(
+                constants.MUTABLE_FILE_PATH,
+                immutable=True,
+            )
+        set_flags = mocked_ioctl.mock_calls[-1][1][2]
+        self.assertEqual(struct.unpack("i", set_flags)[0], 0x80010)
 
-        # Test making a non-existent path to immutable.
-        with self.assertRaises(exceptions.SetAttributeError):
-            processing._set_attribute("+i", constants.NON_EXISTENT_PATH)
+        # Test making an immutable file mutable.
+        with mock.patch("fcntl.ioctl") as mocked_ioctl:
+            mocked_ioctl.return_value = struct.pack("i", 0x80010)
+            processing._set_immutable_flag(
+                constants.IMMUTABLE_FILE_PATH,
+                immutable=False,
+            )
+        set_flags = mocked_ioctl.mock_calls[-1][1][2]
+        self.assertEqual(struct.unpack("i", set_flags)[0], 0x80000)
+
+        # Test flags which can't be set.
+        with mock.patch("fcntl.ioctl") as mocked_ioctl:
+            mocked_ioctl.side_effect = [
+                struct.pack("i", 0x80000),
+                PermissionError(),
+            ]
+            with self.assertRaises(exceptions.SetAttributeError):
+                processing._set_immutable_flag(
+                    constants.MUTABLE_FILE_PATH,
+                    immutable=True,
+                )
 
     def tearDown(self):
         """Delete temporary directories and files.
@@ -1,7 +1,9 @@
+import os
 import unittest
 import unittest.mock as mock
 
 import entomb.reporting as reporting
+import entomb.utilities as utilities
 from tests import (
     constants,
     helpers,
@@ -74,12 +76,15 @@ class TestReporting(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
-        # Test a named pipe.
-        with mock.patch("builtins.print") as mocked_print:
-            reporting.produce_report(
-                constants.NAMED_PIPE_PATH,
-                include_git=False,
-            )
+        # Test a named pipe, which is never opened, as opening a special file
+        # can have side effects.
+        with mock.patch("os.open", wraps=os.open) as mocked_open:
+            with mock.patch("builtins.print") as mocked_print:
+                reporting.produce_report(
+                    constants.NAMED_PIPE_PATH,
+                    include_git=False,
+                )
+        mocked_open.assert_not_called()
         expected = [
             mock.call("\033[?25l", end=""),
             mock.call("Produce report"),
@@ -239,6 +244,73 @@ class TestReporting(unittest.TestCase):
                 include_git=False,
             )
 
+        # Test that the progress bar is not updated after every file in a
+        # large directory.
+        for i in range(1000):
+            file_path = os.path.join(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                "{}.txt".format(i),
+            )
+            open(file_path, "x").close()
+        with mock.patch("builtins.print") as mocked_print:
+            reporting.produce_report(
+                constants.EMPTY_SUBDIRECTORY_PATH,
+                include_git=False,
+            )
+        progress_bar_calls = [
+            c for c in mocked_print.mock_calls if "░" in str(c)
+        ]
+        # The unfinished progress bar is printed once at the start, then after
+        # every hundredth file until the last.
+        self.assertEqual(len(progress_bar_calls), 10)
+
+        # Test a file which is deleted after the path is walked but before the
+        # file is examined, which is counted as inaccessible.
+        walk_path = utilities.walk_path
+
+        def walk_then_delete(path, include_git):
+            paths = list(walk_path(path, include_git))
+            os.remove(constants.SUBDIRECTORY_MUTABLE_FILE_PATH)
+            yield from paths
+
+        with mock.patch.object(utilities, "walk_path", walk_then_delete):
+            with mock.patch("builtins.print") as mocked_print:
+                reporting.produce_report(
+                    constants.SUBDIRECTORY_PATH,
+                    include_git=False,
+                )
+        self.assertIn(
+            mock.call("Inaccessible files", "                    1"),
+            mocked_print.mock_calls,
+        )
+
+        # Test that the named pipe in a directory is counted as inaccessible
+        # without being opened.
+        with mock.patch("os.open", wraps=os.open) as mocked_open:
+            with mock.patch("builtins.print") as mocked_print:
+                reporting.produce_report(
+                    constants.DIRECTORY_PATH,
+                    include_git=False,
+                )
+        opened_paths = [c[1][0] for c in mocked_open.mock_calls]
+        self.assertIn(constants.MUTABLE_FILE_PATH, opened_paths)
+        self.assertNotIn(constants.NAMED_PIPE_PATH, opened_paths)
+
+    def test__examine_file(self):
+        """Test the _examine_file function.
+
+        """
+        # Test a mutable file.
+        self.assertFalse(reporting._examine_file(constants.MUTABLE_FILE_PATH))
+
+        # Test an immutable file.
+        self.assertTrue(
+            reporting._examine_file(constants.IMMUTABLE_FILE_PATH),
+        )
+
+        # Test a named pipe, whose immutable attribute can't be accessed.
+        self.assertIsNone(reporting._examine_file(constants.NAMED_PIPE_PATH))
+
     def test__print_abbreviated_report(self):
         """Test the _print_abbreviated_report function.
 
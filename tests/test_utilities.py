@@ -1,4 +1,5 @@
-import datetime
+import os
+import time
 import unittest
 import unittest.mock as mock
 
@@ -30,19 +31,27 @@ class TestUtilities(unittest.TestCase):
         expected = [mock.call("\033[K", end="")]
         self.assertEqual(mocked_print.mock_calls, expected)
 
-    def test_count_file_paths(self):
-        """Test the count_file_paths function.
+        # Test that nothing is printed if standard output is not a terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                utilities.clear_line()
+        self.assertEqual(mocked_print.mock_calls, [])
+
+    def test_collect_paths(self):
+        """Test the collect_paths function.
 
         """
         # Test a directory excluding git files with a print frequency of 1.
         with mock.patch("builtins.print") as mocked_print:
-            actual_count = utilities.count_file_paths(
-                constants.DIRECTORY_PATH,
-                include_git=False,
+            actual = utilities.collect_paths(
+                utilities.walk_path(constants.DIRECTORY_PATH, False),
+                limit=100,
                 print_frequency=1,
             )
-            expected_count = 8
-            self.assertEqual(actual_count, expected_count)
+        expected = list(
+            utilities.walk_path(constants.DIRECTORY_PATH, include_git=False),
+        )
+        self.assertEqual(actual, expected)
 
         expected_output = [
             mock.call("Counting file paths: 0", end="\r"),
@@ -58,36 +67,35 @@ class TestUtilities(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected_output)
 
-        # Test a directory including git files with a print frequency of 2.
+        # Test a directory including git files with a print frequency of 4.
         with mock.patch("builtins.print") as mocked_print:
-            actual_count = utilities.count_file_paths(
-                constants.DIRECTORY_PATH,
-                include_git=True,
-                print_frequency=2,
+            actual = utilities.collect_paths(
+                utilities.walk_path(constants.DIRECTORY_PATH, True),
+                limit=100,
+                print_frequency=4,
             )
-            expected_count = 10
-            self.assertEqual(actual_count, expected_count)
+        expected = list(
+            utilities.walk_path(constants.DIRECTORY_PATH, include_git=True),
+        )
+        self.assertEqual(actual, expected)
 
         expected_output = [
             mock.call("Counting file paths: 0", end="\r"),
-            mock.call("Counting file paths: 2", end="\r"),
             mock.call("Counting file paths: 4", end="\r"),
-            mock.call("Counting file paths: 6", end="\r"),
             mock.call("Counting file paths: 8", end="\r"),
-            mock.call("Counting file paths: 10", end="\r"),
             mock.call("\033[K", end=""),
         ]
         self.assertEqual(mocked_print.mock_calls, expected_output)
 
         # Test an empty directory.
         with mock.patch("builtins.print") as mocked_print:
-            actual_count = utilities.count_file_paths(
-                constants.EMPTY_SUBDIRECTORY_PATH,
-                include_git=False,
+            actual = utilities.collect_paths(
+                utilities.walk_path(constants.EMPTY_SUBDIRECTORY_PATH, False),
+                limit=100,
                 print_frequency=1,
             )
-            expected_count = 0
-            self.assertEqual(actual_count, expected_count)
+        expected = [(constants.EMPTY_SUBDIRECTORY_PATH, "directory")]
+        self.assertEqual(actual, expected)
 
         expected_output = [
             mock.call("Counting file paths: 0", end="\r"),
@@ -95,6 +103,117 @@ class TestUtilities(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected_output)
 
+        # Test that no more paths than the limit are collected, and that the
+        # rest can still be taken from the walk.
+        paths = utilities.walk_path(constants.DIRECTORY_PATH, False)
+        with mock.patch("builtins.print"):
+            actual = utilities.collect_paths(paths, limit=3)
+        expected = list(
+            utilities.walk_path(constants.DIRECTORY_PATH, include_git=False),
+        )
+        self.assertEqual(actual, expected[:3])
+        self.assertEqual(list(paths), expected[3:])
+
+        # Test that the count is not printed if standard output is not a
+        # terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                actual = utilities.collect_paths(
+                    utilities.walk_path(constants.DIRECTORY_PATH, False),
+                    limit=100,
+                    print_frequency=1,
+                )
+        expected = list(
+            utilities.walk_path(constants.DIRECTORY_PATH, include_git=False),
+        )
+        self.assertEqual(actual, expected)
+        self.assertEqual(mocked_print.mock_calls, [])
+
+    def test_examine_paths(self):
+        """Test the examine_paths function.
+
+        """
+        # Because _examine_walked_paths() contributes to examine_paths() it is
+        # not tested in isolation, but is tested as part of examine_paths()
+        # here.
+        expected = [
+            (path, path_type, path if path_type == "file" else None)
+            for path, path_type in utilities.walk_path(
+                constants.DIRECTORY_PATH,
+                include_git=False,
+            )
+        ]
+
+        # Test a path which is walked in full before it is examined.
+        with mock.patch("builtins.print") as mocked_print:
+            actual = list(
+                utilities.examine_paths(
+                    constants.DIRECTORY_PATH,
+                    include_git=False,
+                    examine=str,
+                    jobs=2,
+                ),
+            )
+        self.assertEqual(actual, expected)
+        progress_bars = [
+            c[1][0] for c in mocked_print.mock_calls if c[2] == {"end": "\r"}
+        ]
+        self.assertEqual(
+            progress_bars,
+            [
+                "Counting file paths: 0",
+                "░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  0.0%",
+                "████████████████████████████████████████",
+            ],
+        )
+
+        # Test redrawing the progress bar after a file.
+        with mock.patch("builtins.print") as mocked_print:
+            actual = list(
+                utilities.examine_paths(
+                    constants.DIRECTORY_PATH,
+                    include_git=False,
+                    examine=str,
+                    jobs=2,
+                    redraw_after=lambda result: result is not None,
+                ),
+            )
+        self.assertEqual(actual, expected)
+        unfinished_progress_bars = [
+            c for c in mocked_print.mock_calls if "░" in str(c)
+        ]
+        # The unfinished progress bar is printed once at the start, then after
+        # every file except the last file path, when the bar is finished.
+        file_paths = [e for e in expected if e[1] != "directory"]
+        redrawn_count = sum(1 for e in file_paths[:-1] if e[1] == "file")
+        self.assertEqual(len(unfinished_progress_bars), 1 + redrawn_count)
+
+        # Test a path which is too large to walk in full before it is
+        # examined, for which only the count of examined file paths is
+        # printed until the progress bar is finished.
+        with mock.patch("entomb.constants.READ_AHEAD_LIMIT", 3):
+            with mock.patch("builtins.print") as mocked_print:
+                actual = list(
+                    utilities.examine_paths(
+                        constants.DIRECTORY_PATH,
+                        include_git=False,
+                        examine=str,
+                        jobs=2,
+                    ),
+                )
+        self.assertEqual(actual, expected)
+        progress_bars = [
+            c[1][0] for c in mocked_print.mock_calls if c[2] == {"end": "\r"}
+        ]
+        self.assertEqual(
+            progress_bars,
+            [
+                "Counting file paths: 0",
+                "0 file paths examined",
+                "████████████████████████████████████████",
+            ],
+        )
+
     def test_file_is_immutable(self):
         """Test the file_is_immutable function.
 
@@ -109,20 +228,22 @@ class TestUtilities(unittest.TestCase):
             utilities.file_is_immutable(constants.MUTABLE_FILE_PATH),
         )
 
-        # Test a directory path.
-        with self.assertRaises(AssertionError):
-            utilities.file_is_immutable(constants.DIRECTORY_PATH)
+        # Test a directory path, whose immutable attribute is read like a
+        # file's.
+        self.assertFalse(
+            utilities.file_is_immutable(constants.DIRECTORY_PATH),
+        )
 
-        # Test a link path.
-        with self.assertRaises(AssertionError):
+        # Test a link path, which isn't followed.
+        with self.assertRaises(exceptions.GetAttributeError):
             utilities.file_is_immutable(constants.LINK_PATH)
 
         # Test a path which does not exist.
-        with self.assertRaises(AssertionError):
+        with self.assertRaises(exceptions.GetAttributeError):
             utilities.file_is_immutable(constants.NON_EXISTENT_PATH)
 
         # Test a string which can't be parsed as a path.
-        with self.assertRaises(AssertionError):
+        with self.assertRaises(exceptions.GetAttributeError):
             utilities.file_is_immutable(constants.NON_PATH_STRING)
 
         # Test a named pipe.
@@ -133,84 +254,6 @@ class TestUtilities(unittest.TestCase):
         with self.assertRaises(exceptions.GetAttributeError):
             utilities.file_is_immutable(constants.READABLE_BY_ROOT_FILE_PATH)
 
-    def test_file_paths(self):
-        """Test the file_paths function.
-
-        """
-        # Test a directory excluding git files.
-        actual = utilities.file_paths(
-            constants.DIRECTORY_PATH,
-            include_git=False,
-        )
-        expected = [
-            constants.IMMUTABLE_FILE_PATH,
-            constants.LINK_PATH,
-            constants.MUTABLE_FILE_PATH,
-            constants.NAMED_PIPE_PATH,
-            constants.READABLE_BY_ROOT_FILE_PATH,
-            constants.SUBDIRECTORY_IMMUTABLE_FILE_PATH,
-            constants.SUBDIRECTORY_LINK_PATH,
-            constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
-        ]
-        self.assertEqual(sorted(actual), sorted(expected))
-
-        # Test a directory including git files.
-        actual = utilities.file_paths(
-            constants.DIRECTORY_PATH,
-            include_git=True,
-        )
-        expected = [
-            constants.GIT_DIRECTORY_MUTABLE_FILE_PATH,
-            constants.GIT_SUBDIRECTORY_MUTABLE_FILE_PATH,
-            constants.IMMUTABLE_FILE_PATH,
-            constants.LINK_PATH,
-            constants.MUTABLE_FILE_PATH,
-            constants.NAMED_PIPE_PATH,
-            constants.READABLE_BY_ROOT_FILE_PATH,
-            constants.SUBDIRECTORY_IMMUTABLE_FILE_PATH,
-            constants.SUBDIRECTORY_LINK_PATH,
-            constants.SUBDIRECTORY_MUTABLE_FILE_PATH,
-        ]
-        self.assertEqual(sorted(actual), sorted(expected))
-
-        # Test a file.
-        actual = utilities.file_paths(
-            constants.IMMUTABLE_FILE_PATH,
-            include_git=False,
-        )
-        expected = [constants.IMMUTABLE_FILE_PATH]
-        self.assertEqual(sorted(actual), sorted(expected))
-
-        # Test a link.
-        actual = utilities.file_paths(constants.LINK_PATH, include_git=False)
-        expected = [constants.LINK_PATH]
-        self.assertEqual(sorted(actual), sorted(expected))
-
-        # Test a directory which does not exist.
-        with self.assertRaises(AssertionError):
-            paths = utilities.file_paths(
-                constants.NON_PATH_STRING,
-                include_git=True,
-            )
-            # Ths exception will only be raised once the generator is iterated.
-            next(paths)
-
-        # Test a named pipe.
-        actual = utilities.file_paths(
-            constants.NAMED_PIPE_PATH,
-            include_git=False,
-        )
-        expected = [constants.NAMED_PIPE_PATH]
-        self.assertEqual(sorted(actual), sorted(expected))
-
-        # Test a file which is readable only by root.
-        actual = utilities.file_paths(
-            constants.READABLE_BY_ROOT_FILE_PATH,
-            include_git=True,
-        )
-        expected = [constants.READABLE_BY_ROOT_FILE_PATH]
-        self.assertEqual(sorted(actual), sorted(expected))
-
     def test_hide_cursor(self):
         """Test the hide_cursor function.
 
@@ -227,6 +270,73 @@ class TestUtilities(unittest.TestCase):
         ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
+        # Test that the cursor is left alone if standard output is not a
+        # terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                with utilities.hide_cursor():
+                    print("testing")
+        expected = [mock.call("testing")]
+        self.assertEqual(mocked_print.mock_calls, expected)
+
+    def test_inode_flags(self):
+        """Test the inode_flags function.
+
+        """
+        # Test an immutable file, whose flags include 0x10.
+        with utilities.inode_flags(constants.IMMUTABLE_FILE_PATH) as opened:
+            file_descriptor, flags = opened
+            self.assertTrue(flags & 0x10)
+
+        # Test that the file is closed.
+        with self.assertRaises(OSError):
+            os.fstat(file_descriptor)
+
+        # Test a mutable file.
+        with utilities.inode_flags(constants.MUTABLE_FILE_PATH) as opened:
+            _, flags = opened
+            self.assertFalse(flags & 0x10)
+
+        # Test a link, which isn't followed.
+        with self.assertRaises(OSError):
+            with utilities.inode_flags(constants.LINK_PATH):
+                pass
+
+        # Test a named pipe, which is opened without blocking but has no
+        # flags.
+        with self.assertRaises(OSError):
+            with utilities.inode_flags(constants.NAMED_PIPE_PATH):
+                pass
+
+    def test_map_in_threads(self):
+        """Test the map_in_threads function.
+
+        """
+        # Test that results are in the same order as the items.
+        actual = utilities.map_in_threads(lambda x: x * 2, range(1000), 8)
+        expected = [x * 2 for x in range(1000)]
+        self.assertEqual(list(actual), expected)
+
+        # Test items which span several chunks.
+        actual = utilities.map_in_threads(str, range(10), 2, chunk_size=3)
+        expected = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
+        self.assertEqual(list(actual), expected)
+
+        # Test no items.
+        actual = utilities.map_in_threads(str, [], 1)
+        expected = []
+        self.assertEqual(list(actual), expected)
+
+        # Test that an exception raised by the function is raised again.
+        with self.assertRaises(exceptions.GetAttributeError):
+            list(
+                utilities.map_in_threads(
+                    utilities.file_is_immutable,
+                    [constants.NAMED_PIPE_PATH],
+                    1,
+                ),
+            )
+
     def test_print_header(self):
         """Test the print_header function.
 
@@ -243,13 +353,13 @@ class TestUtilities(unittest.TestCase):
         """Test the progress_bar function.
 
         """
-        start_time = datetime.datetime.now()
+        start_time = time.monotonic()
 
         # Test progress of exactly 0%.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(microseconds=10)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 0.00001
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=0,
@@ -267,9 +377,9 @@ class TestUtilities(unittest.TestCase):
 
         # Test progress of exactly 50%.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(seconds=5)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 5
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=5000,
@@ -287,9 +397,9 @@ class TestUtilities(unittest.TestCase):
 
         # Test progress of exactly 100%.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(seconds=10)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 10
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=12345,
@@ -305,9 +415,9 @@ class TestUtilities(unittest.TestCase):
 
         # Test progress rounding down to 99.9% rather than up to 100%.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(seconds=10)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 10
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=9999,
@@ -323,11 +433,32 @@ class TestUtilities(unittest.TestCase):
             ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
+        # Test a percentage which floating point arithmetic would round down to
+        # 28.9%.
+        with mock.patch("builtins.print") as mocked_print:
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 29
+                mocked_monotonic.return_value = now
+                utilities.print_progress_bar(
+                    start_time=start_time,
+                    count=29,
+                    total=100,
+                    print_frequency=1,
+                )
+        expected_progress_bar = (
+            "███████████░░░░░░░░░░░░░░░░░░░░░░░░░░░░░  29.0%  |  1m 11s to go"
+        )
+        expected = [
+            mock.call("\033[K", end=""),
+            mock.call(expected_progress_bar, end="\r"),
+        ]
+        self.assertEqual(mocked_print.mock_calls, expected)
+
         # Test printing nothing when frequency condition is not met.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(seconds=1)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 1
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=1001,
@@ -337,11 +468,36 @@ class TestUtilities(unittest.TestCase):
         expected = []
         self.assertEqual(mocked_print.mock_calls, expected)
 
+        # Test progress towards a total which is not known yet.
+        with mock.patch("builtins.print") as mocked_print:
+            utilities.print_progress_bar(
+                start_time=start_time,
+                count=12300,
+                total=None,
+                print_frequency=100,
+            )
+        expected = [
+            mock.call("\033[K", end=""),
+            mock.call("12,300 file paths examined", end="\r"),
+        ]
+        self.assertEqual(mocked_print.mock_calls, expected)
+
+        # Test printing nothing when standard output is not a terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                utilities.print_progress_bar(
+                    start_time=start_time,
+                    count=10000,
+                    total=10000,
+                    print_frequency=1,
+                )
+        self.assertEqual(mocked_print.mock_calls, [])
+
         # Test for count of 0 and total of 0.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(milliseconds=10)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + 0.01
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=0,
@@ -357,9 +513,9 @@ class TestUtilities(unittest.TestCase):
 
         # Test for an operation which takes several hours.
         with mock.patch("builtins.print") as mocked_print:
-            with mock.patch("datetime.datetime") as mocked_datetime:
-                now = start_time + datetime.timedelta(hours=1, minutes=23)
-                mocked_datetime.now.return_value = now
+            with mock.patch("time.monotonic") as mocked_monotonic:
+                now = start_time + (1 * 60 + 23) * 60
+                mocked_monotonic.return_value = now
                 utilities.print_progress_bar(
                     start_time=start_time,
                     count=5840300,
@@ -376,6 +532,117 @@ class TestUtilities(unittest.TestCase):
             ]
         self.assertEqual(mocked_print.mock_calls, expected)
 
+    def test_progress_section(self):
+        """Test the progress_section function.
+
+        """
+        with mock.patch("builtins.print") as mocked_print:
+            with utilities.progress_section():
+                print("testing", end="\r")
+        expected = [
+            mock.call("Progress"),
+            mock.call("--------"),
+            mock.call("testing", end="\r"),
+            mock.call(),
+            mock.call(),
+        ]
+        self.assertEqual(mocked_print.mock_calls, expected)
+
+        # Test that nothing is printed if standard output is not a terminal.
+        with helpers.patch_stdout_is_a_terminal(False):
+            with mock.patch("builtins.print") as mocked_print:
+                with utilities.progress_section():
+                    pass
+        self.assertEqual(mocked_print.mock_calls, [])
+
+    def test_walk_path(self):
+        """Test the walk_path function.
+
+        """
+        # Test a directory excluding git files.
+        actual = utilities.walk_path(
+            constants.DIRECTORY_PATH,
+            include_git=False,
+        )
+        expected = [
+            (constants.DIRECTORY_PATH, "directory"),
+            (constants.EMPTY_SUBDIRECTORY_PATH, "directory"),
+            (constants.IMMUTABLE_FILE_PATH, "file"),
+            (constants.LINK_PATH, "link"),
+            (constants.MUTABLE_FILE_PATH, "file"),
+            (constants.NAMED_PIPE_PATH, "special file"),
+            (constants.READABLE_BY_ROOT_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_IMMUTABLE_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_LINK_PATH, "link"),
+            (constants.SUBDIRECTORY_MUTABLE_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_PATH, "directory"),
+        ]
+        self.assertEqual(sorted(actual), sorted(expected))
+
+        # Test a directory including git files.
+        actual = utilities.walk_path(
+            constants.DIRECTORY_PATH,
+            include_git=True,
+        )
+        expected = [
+            (constants.DIRECTORY_PATH, "directory"),
+            (constants.EMPTY_SUBDIRECTORY_PATH, "directory"),
+            (constants.GIT_DIRECTORY_MUTABLE_FILE_PATH, "file"),
+            (constants.GIT_DIRECTORY_PATH, "directory"),
+            (constants.GIT_SUBDIRECTORY_MUTABLE_FILE_PATH, "file"),
+            (constants.GIT_SUBDIRECTORY_PATH, "directory"),
+            (constants.IMMUTABLE_FILE_PATH, "file"),
+            (constants.LINK_PATH, "link"),
+            (constants.MUTABLE_FILE_PATH, "file"),
+            (constants.NAMED_PIPE_PATH, "special file"),
+            (constants.READABLE_BY_ROOT_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_IMMUTABLE_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_LINK_PATH, "link"),
+            (constants.SUBDIRECTORY_MUTABLE_FILE_PATH, "file"),
+            (constants.SUBDIRECTORY_PATH, "directory"),
+        ]
+        self.assertEqual(sorted(actual), sorted(expected))
+
+        # Test that a directory is visited before the files in it.
+        actual = list(
+            utilities.walk_path(
+                constants.SUBDIRECTORY_PATH,
+                include_git=False,
+            ),
+        )
+        expected = (constants.SUBDIRECTORY_PATH, "directory")
+        self.assertEqual(actual[0], expected)
+
+        # Test a file.
+        actual = utilities.walk_path(
+            constants.IMMUTABLE_FILE_PATH,
+            include_git=False,
+        )
+        expected = [(constants.IMMUTABLE_FILE_PATH, "file")]
+        self.assertEqual(list(actual), expected)
+
+        # Test a link.
+        actual = utilities.walk_path(constants.LINK_PATH, include_git=False)
+        expected = [(constants.LINK_PATH, "link")]
+        self.assertEqual(list(actual), expected)
+
+        # Test a named pipe.
+        actual = utilities.walk_path(
+            constants.NAMED_PIPE_PATH,
+            include_git=False,
+        )
+        expected = [(constants.NAMED_PIPE_PATH, "special file")]
+        self.assertEqual(list(actual), expected)
+
+        # Test a path which does not exist.
+        with self.assertRaises(AssertionError):
+            paths = utilities.walk_path(
+                constants.NON_EXISTENT_PATH,
+                include_git=False,
+            )
+            # Ths exception will only be raised once the generator is iterated.
+            next(paths)
+
     def test__add_percentage_to_progress_bar(self):
         """Test the _add_percentage_to_progress_bar function.
 
@@ -400,6 +667,14 @@ class TestUtilities(unittest.TestCase):
         # is not tested in isolation, but is tested as part of
         # print_progress_bar() by test_print_progress_bar().
 
+    def test__entry_is_directory(self):
+        """Test the _entry_is_directory function.
+
+        """
+        # Because _entry_is_directory() contributes to walk_path() it is not
+        # tested in isolation, but is tested as part of walk_path() by
+        # test_walk_path().
+
     def test__get_immutable_flag(self):
         """Test the _get_immutable_flag function.
 